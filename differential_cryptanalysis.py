@@ -1,7 +1,64 @@
-from collections import defaultdict
-from tabulate import tabulate
-import pandas as pd
-import random
+from typing import Optional
+import numpy as np
+
+# Number of candidate subkeys scored together in one broadcast during the attack
+KEY_TILE_SIZE = 4096
+
+# Number of ciphertext pairs scored together in one broadcast during the attack
+PAIR_BATCH_SIZE = 128
+
+
+def _compute_ddt(sbox_table: np.ndarray) -> np.ndarray:
+    """
+    Computes the difference distribution table of an S-box lookup table.
+
+    Args:
+        sbox_table (np.ndarray): S-box outputs indexed by input value.
+
+    Returns:
+        np.ndarray: Table of counts indexed as [ΔX, ΔY].
+    """
+    sbox_size = len(sbox_table)
+    inputs = np.arange(sbox_size)
+    delta_xs = inputs[:, None]
+    delta_ys = sbox_table[inputs] ^ sbox_table[inputs ^ delta_xs]
+    cells = (delta_xs * sbox_size + delta_ys).ravel()
+    return np.bincount(cells, minlength=sbox_size * sbox_size) \
+        .reshape(sbox_size, sbox_size).astype(np.int32)
+
+
+def _nibble_nonzero_mask(input_data: int) -> int:
+    """
+    Computes a mask with bit 4k set if and only if nibble k of the 16-bit input is non-zero.
+
+    Args:
+        input_data (int): Input data.
+
+    Returns:
+        int: Mask of non-zero nibbles.
+    """
+    return (input_data | (input_data >> 1) | (input_data >> 2) | (input_data >> 3)) & 0x1111
+
+
+def _count_matching_pairs(inv_sub_block: np.ndarray, ciphertexts_1: np.ndarray, ciphertexts_2: np.ndarray,
+                          subkeys: np.ndarray, diff_characteristic: int) -> np.ndarray:
+    """
+    Counts, for each subkey, the ciphertext pairs whose partial decryptions differ by the differential characteristic.
+
+    Args:
+        inv_sub_block (np.ndarray): Inverse substitution of every block value.
+        ciphertexts_1 (np.ndarray): First ciphertext of each pair.
+        ciphertexts_2 (np.ndarray): Second ciphertext of each pair.
+        subkeys (np.ndarray): Candidate subkeys.
+        diff_characteristic (int): Differential characteristic to check against.
+
+    Returns:
+        np.ndarray: Number of matching pairs for each subkey.
+    """
+    partial_decryptions_1 = np.take(inv_sub_block, ciphertexts_1[:, None] ^ subkeys[None, :])
+    partial_decryptions_2 = np.take(inv_sub_block, ciphertexts_2[:, None] ^ subkeys[None, :])
+    return np.count_nonzero((partial_decryptions_1 ^ partial_decryptions_2) == diff_characteristic, axis=0)
+
 
 class DifferentialCryptanalysis:
     """
@@ -9,7 +66,7 @@ class DifferentialCryptanalysis:
 
     Attributes:
         sp_network (SP_Network): The SP network to be analyzed.
-        difference_distribution (dict): A dictionary representing the difference distribution table for the S-box.
+        ddt (np.ndarray): A 2-D array representing the difference distribution table for the S-box, indexed as [ΔX, ΔY].
         data_size (int): Size of the data block used in the SP network.
 
     Methods:
@@ -33,7 +90,7 @@ class DifferentialCryptanalysis:
             Computes the output differential characteristic for a given input/output difference and target S-box.
         convert_to_block(active_sboxes: list, data: int) -> int:
             Converts data into a block based on the active S-boxes.
-        perform_attack(ciphertext_pairs: list, diff_characteristic: int) -> list:
+        perform_attack(ciphertext_pairs: tuple, diff_characteristic: int) -> Optional[int]:
             Performs a differential cryptanalysis attack to extract the last subkey bits.
         check_expected_difference(partial_decryption_1: int, partial_decryption_2: int, diff_characteristic: int) -> bool:
             Checks if the XOR of two partial decryptions matches the specified differential characteristic.
@@ -41,7 +98,7 @@ class DifferentialCryptanalysis:
             Partially decrypts the last round of the cipher with the given subkey value.
         extract_subkey_bits(subkey_value: int) -> list:
             Extracts the subkey bits from the given subkey value.
-        generate_plaintext_and_ciphertext_pairs(delta_p: int, num_pairs: int) -> list:
+        generate_plaintext_and_ciphertext_pairs(delta_p: int, num_pairs: int) -> tuple:
             Generates plaintext pairs and their corresponding ciphertext pairs satisfying the differential characteristic.
     """
 
@@ -53,37 +110,34 @@ class DifferentialCryptanalysis:
             sp_network (SP_Network): The SP network to be analyzed.
         """
         self.sp_network = sp_network
-        self.difference_distribution = {}
+        self.ddt = None
+        self._max_delta_y = None
         self.data_size = sp_network.data_size
+        self._inv_sub_block = sp_network.inv_sub_block
 
     def calculate_difference_distribution(self) -> None:
         """
         Calculates the difference distribution table for the S-box.
         """
-        for delta_x in range(self.data_size):
-            self.difference_distribution[delta_x] = {}
-
-            for delta_y in range(self.data_size):
-                self.difference_distribution[delta_x][delta_y] = 0
-
-                for x in range(self.data_size):
-                    y = self.sp_network.sbox(x)
-                    x2 = x ^ delta_x
-                    y2 = self.sp_network.sbox(x2)
-                    pred_delta_y = y ^ y2
-                    if pred_delta_y == delta_y:
-                        self.difference_distribution[delta_x][delta_y] += 1
+        sbox_table = np.frombuffer(self.sp_network.sbox_fwd, dtype=np.uint8)
+        self.ddt = _compute_ddt(sbox_table)
+        self._max_delta_y = self.ddt.argmax(axis=1).tolist()
 
     def print_difference_distribution(self) -> None:
         """
         Prints the difference distribution table for the S-box.
         """
         print("Difference Distribution Table ΔX and ΔY:\n")
-        transposed_data = {col: {row: self.difference_distribution[row][col]
-                                 for row in self.difference_distribution}
-                           for col in self.difference_distribution[0]}
-        df = pd.DataFrame(transposed_data)
-        print(tabulate(df, headers='keys', tablefmt='psql'))
+        sbox_size = len(self.ddt)
+        width = max(len(str(sbox_size - 1)), len(str(self.ddt.max())))
+        border = '+' + '+'.join('-' * (width + 2) for _ in range(sbox_size + 1)) + '+'
+
+        print(border)
+        print('| ' + ' | '.join(f"{value:>{width}}" for value in ['', *range(sbox_size)]) + ' |')
+        print(border)
+        for delta_x, row in enumerate(self.ddt.tolist()):
+            print('| ' + ' | '.join(f"{value:>{width}}" for value in [delta_x, *row]) + ' |')
+        print(border)
 
     def get_max_frequency_difference(self) -> tuple:
         """
@@ -92,19 +146,13 @@ class DifferentialCryptanalysis:
         Returns:
             tuple: A tuple containing the input difference, output difference, and their frequency.
         """
-        max_frequency = 0
-        max_frequency_delta_x = None
-        max_frequency_delta_y = None
-        for delta_x, delta_y_counts in self.difference_distribution.items():
-            for delta_y, count in delta_y_counts.items():
-                if delta_x == 0 and delta_y == 0:
-                    continue
-                if count > max_frequency:
-                    max_frequency = count
-                    max_frequency_delta_x = delta_x
-                    max_frequency_delta_y = delta_y
+        frequencies = self.ddt.copy()
+        frequencies[0, 0] = 0
+        max_frequency_delta_x, max_frequency_delta_y = np.unravel_index(
+            frequencies.argmax(), frequencies.shape)
+        max_frequency = frequencies[max_frequency_delta_x, max_frequency_delta_y]
 
-        return max_frequency_delta_x, max_frequency_delta_y, max_frequency
+        return int(max_frequency_delta_x), int(max_frequency_delta_y), int(max_frequency)
 
     def get_max_delta_y(self, delta_x) -> int:
         """
@@ -116,9 +164,7 @@ class DifferentialCryptanalysis:
         Returns:
             int: Output difference with maximum frequency.
         """
-        delta_y_dict = self.difference_distribution[delta_x]
-        max_delta_y = max(delta_y_dict, key=delta_y_dict.get)
-        return max_delta_y
+        return self._max_delta_y[delta_x]
 
     def get_active_sboxes(self, input_data: int) -> list:
         """
@@ -131,9 +177,11 @@ class DifferentialCryptanalysis:
             list: List of active S-box indices.
         """
         active_sboxes = []
-        for i in range(4):
-            if (input_data >> (i * 4)) & 0xF > 0:
-                active_sboxes.append(4 - i)
+        mask = _nibble_nonzero_mask(input_data)
+        while mask:
+            bit = mask & -mask
+            active_sboxes.append(4 - (bit.bit_length() - 1) // 4)
+            mask ^= bit
         return active_sboxes
 
     def get_output_difference(self, input_difference: int) -> int:
@@ -171,8 +219,7 @@ class DifferentialCryptanalysis:
             delta_y = (v >> (i * 4)) & 0xF
             if delta_x == 0 and delta_y == 0:
                 continue
-            probability *= self.difference_distribution[delta_x][delta_y] / \
-                self.data_size
+            probability *= int(self.ddt[delta_x, delta_y]) / self.data_size
         return probability
 
     def get_delta_p(self, delta_x: int, target_sbox: int) -> int:
@@ -219,46 +266,57 @@ class DifferentialCryptanalysis:
         Returns:
             int: Data converted into a block.
         """
-        groups = []
-        for i in range(len(active_sboxes)):
-            groups.insert(0, (data >> (4 * i)) & 0xF)
-
         output = 0
-        for i in range(len(active_sboxes)):
-            sbox_index = active_sboxes[i]
-            group = groups[i]
+        for i, sbox_index in enumerate(reversed(active_sboxes)):
+            group = (data >> (4 * i)) & 0xF
             output |= group << (self.data_size - sbox_index * 4)
 
         return output
 
-    def perform_attack(self, ciphertext_pairs: list, diff_characteristic: int) -> list:
+    def perform_attack(self, ciphertext_pairs: tuple, diff_characteristic: int) -> Optional[int]:
         """
         Performs a differential cryptanalysis attack to extract the last subkey bits.
 
         Args:
-            ciphertext_pairs (list): List of ciphertext pairs corresponding to plaintext pairs.
+            ciphertext_pairs (tuple): Two parallel arrays holding the first and second ciphertext of each pair.
+            diff_characteristic (int): Expected difference of the partial decryptions.
 
         Returns:
-            None | list: Extracted last subkey bits.
+            None | int: Last round subkey whose partial decryptions match the characteristic most often.
+
+        Raises:
+            ValueError: If the ciphertext pairs are not a tuple of two 1-D arrays of the same length.
         """
-        subkey_counts = defaultdict(int)
         active_sboxes = self.get_active_sboxes(diff_characteristic)
         num_of_keys = (2 ** 4) ** len(active_sboxes)
-
-        for i in range(1, num_of_keys):
-            subkey = self.convert_to_block(active_sboxes, i)
-            count = sum(
-                self.check_expected_difference(
-                    self.partial_decrypt(ciphertext_1, subkey),
-                    self.partial_decrypt(ciphertext_2, subkey),
-                    diff_characteristic
-                )
-                for ciphertext_1, ciphertext_2 in ciphertext_pairs
-            )
-            subkey_counts[subkey] = count
-
-        if subkey_counts:
-            return max(subkey_counts, key=subkey_counts.get)
+        shifts = np.array([self.data_size - sbox_index * 4 for sbox_index in active_sboxes], dtype=int)
+        nibbles = np.indices((2 ** 4,) * len(active_sboxes)).reshape(len(active_sboxes), num_of_keys)
+        subkeys = (nibbles << shifts[:, None]).sum(axis=0).astype(np.uint16)[1:]
+        if not (isinstance(ciphertext_pairs, tuple) and len(ciphertext_pairs) == 2
+                and all(isinstance(ciphertexts, np.ndarray) for ciphertexts in ciphertext_pairs)):
+            raise ValueError(
+                'Ciphertext pairs must be a tuple of two arrays, as returned by generate_plaintext_and_ciphertext_pairs.')
+        ciphertexts_1, ciphertexts_2 = ciphertext_pairs
+        if ciphertexts_1.ndim != 1 or ciphertexts_1.shape != ciphertexts_2.shape:
+            raise ValueError(
+                'Ciphertext pairs must be two 1-D arrays of the same length.')
+        ciphertexts_1 = ciphertexts_1.astype(np.uint16, copy=False)
+        ciphertexts_2 = ciphertexts_2.astype(np.uint16, copy=False)
+
+        if not subkeys.size:
+            return None
+
+        counts = np.zeros(len(subkeys), dtype=np.int32)
+        num_pairs = len(ciphertexts_1)
+        for batch_start in range(0, num_pairs, PAIR_BATCH_SIZE):
+            batch_end = batch_start + PAIR_BATCH_SIZE
+            for start in range(0, len(subkeys), KEY_TILE_SIZE):
+                end = start + KEY_TILE_SIZE
+                counts[start:end] += _count_matching_pairs(
+                    self._inv_sub_block, ciphertexts_1[batch_start:batch_end],
+                    ciphertexts_2[batch_start:batch_end], subkeys[start:end], diff_characteristic)
+
+        return int(subkeys[counts.argmax()])
 
     def check_expected_difference(self, partial_decryption_1: int, partial_decryption_2: int, diff_characteristic: int) -> bool:
         """
@@ -288,7 +346,7 @@ class DifferentialCryptanalysis:
         partially_decrypted_ciphertext = ciphertext ^ subkey_value
         return self.sp_network.substitute(partially_decrypted_ciphertext, True)
 
-    def generate_plaintext_and_ciphertext_pairs(self, delta_p: int, num_pairs: int) -> list:
+    def generate_plaintext_and_ciphertext_pairs(self, delta_p: int, num_pairs: int) -> tuple:
         """
         Generates plaintext pairs and their corresponding ciphertext pairs satisfying the differential characteristic.
 
@@ -297,17 +355,14 @@ class DifferentialCryptanalysis:
             num_pairs (int): Number of pairs to generate.
 
         Returns:
-            list: List of tuples containing plaintext pairs and their corresponding ciphertext pairs.
+            tuple: Two parallel uint16 arrays holding the first and second ciphertext of each pair.
         """
-        ciphertext_pairs = []
-        for _ in range(num_pairs):
-            plaintext_1 = random.randint(0, 2 ** self.data_size - 1)
-            plaintext_2 = plaintext_1 ^ delta_p
-            ciphertext_1 = self.sp_network.encrypt(plaintext_1)
-            ciphertext_2 = self.sp_network.encrypt(plaintext_2)
-            ciphertext_pairs.append((ciphertext_1, ciphertext_2))
+        plaintexts_1 = np.random.randint(0, 2 ** self.data_size, size=num_pairs, dtype=np.uint16)
+        plaintexts_2 = plaintexts_1 ^ delta_p
+        ciphertexts_1 = self.sp_network.encrypt_array(plaintexts_1)
+        ciphertexts_2 = self.sp_network.encrypt_array(plaintexts_2)
 
-        return ciphertext_pairs
+        return ciphertexts_1, ciphertexts_2
 
     def extract_subkey_bits(self, subkey_value: int) -> list:
         """
@@ -319,12 +374,9 @@ class DifferentialCryptanalysis:
         Returns:
             list: Extracted subkey bits.
         """
-        subkey_str = format(subkey_value, '016b')
-        extracted_subkey_bits = []
-        for i in range(0, self.data_size, 4):
-            if subkey_str[i:i+4] != '0000':
-                extracted_subkey_bits.append(int(subkey_str[i:i+4], 2))
-        return extracted_subkey_bits
+        nibbles = ((subkey_value >> (self.data_size - i)) & 0xF
+                   for i in range(4, self.data_size + 1, 4))
+        return [nibble for nibble in nibbles if nibble]
 
     def get_binary_rep_of_subkey(self, subkey_value: int, active_sboxes: list) -> str:
         """
@@ -336,9 +388,6 @@ class DifferentialCryptanalysis:
         Returns:
             str: Binary representation of the subkey.
         """
-        subkey_str = ''
-        for i in range(1, 5):
-            sub_bits = (subkey_value >> (16 - i * 4)) & 0xF
-            subkey_str += format(sub_bits, '04b') + \
-                ' ' if i in active_sboxes else 'XXXX '
-        return subkey_str
\ No newline at end of file
+        nibbles = ((subkey_value >> (16 - i * 4)) & 0xF for i in range(1, 5))
+        return ' '.join(f"{nibble:04b}" if i in active_sboxes else 'XXXX'
+                        for i, nibble in enumerate(nibbles, 1))
\ No newline at end of file
@@ -1,12 +1,19 @@
+from array import array
+from functools import cached_property
+import numpy as np
+
+
 class SP_Network:
     """
     Class implementing an SP network encryption scheme.
 
     Attributes:
-        keys (list): List of round keys.
+        keys (tuple): Round keys, fixed at construction.
         substitution (dict): Substitution dictionary for S-box.
         permutation (dict): Permutation dictionary for P-box.
-        inv_substitution (dict): Inverse substitution dictionary for S-box.
+        sbox_fwd (bytes): Lookup table for the S-box, indexed by input value.
+        sbox_inv (bytes): Lookup table for the inverse S-box, indexed by input value.
+        inv_sub_block (np.ndarray): Read-only inverse substitution of every block value, indexed by block value.
         rounds (int): Number of encryption rounds.
         data_size (int): Size of the input data.
 
@@ -21,6 +28,8 @@ class SP_Network:
             Performs substitution using the S-box.
         encrypt(plain: int) -> int:
             Encrypts the plaintext.
+        encrypt_array(plains: np.ndarray) -> np.ndarray:
+            Encrypts an array of plaintexts.
         decrypt(cipher: int) -> int:
             Decrypts the ciphertext.
     """
@@ -41,12 +50,25 @@ class SP_Network:
             raise ValueError(
                 'Substitution and permutation dictionaries must be of the same size.')
 
-        self.keys = keys
+        self.keys = tuple(keys)
         self.substitution = substitution
-        self.inv_substitution = {v: k for k, v in substitution.items()}
+        self.sbox_fwd = bytes(substitution[i] for i in range(len(substitution)))
+        sbox_inv = bytearray(len(substitution))
+        for k, v in substitution.items():
+            sbox_inv[v] = k
+        self.sbox_inv = bytes(sbox_inv)
         self.permutation = permutation
         self.rounds = len(keys) - 1
         self.data_size = len(substitution)
+        self._perm_masks = self._build_permutation_masks()
+        self._perm_lut = array('H', (self._permute_scalar(i)
+                                     for i in range(1 << self.data_size)))
+        self._sub_lut = array('H', (self._substitute_scalar(i, False)
+                                    for i in range(1 << self.data_size)))
+        self._inv_sub_lut = array('H', (self._substitute_scalar(i, True)
+                                        for i in range(1 << self.data_size)))
+        self.inv_sub_block = np.frombuffer(self._inv_sub_lut, dtype=np.uint16)
+        self.inv_sub_block.flags.writeable = False
 
     def keymix(self, round_num: int, input_data: int) -> int:
         """
@@ -72,8 +94,7 @@ class SP_Network:
         Returns:
             int: Substituted output.
         """
-        sbox_dict = self.inv_substitution if invert else self.substitution
-        return sbox_dict.get(input_data, 0)
+        return (self.sbox_inv if invert else self.sbox_fwd)[input_data]
 
     def permute(self, input_data: int) -> int:
         """
@@ -85,10 +106,38 @@ class SP_Network:
         Returns:
             int: Permuted output.
         """
-        output_data = 0
+        return self._perm_lut[input_data]
+
+    def _build_permutation_masks(self) -> list:
+        """
+        Groups the P-box bits that move by the same distance into (mask, shift) pairs.
+
+        Returns:
+            list: List of (mask, shift) tuples; a positive shift moves bits left.
+        """
+        masks = {}
         for i in range(1, self.data_size + 1):
-            output_data |= ((input_data >> (self.data_size -
-                            self.permutation[i])) & 1) << (self.data_size - i)
+            source_bit = self.data_size - self.permutation[i]
+            shift = self.permutation[i] - i
+            masks[shift] = masks.get(shift, 0) | (1 << source_bit)
+        return [(mask, shift) for shift, mask in masks.items()]
+
+    def _permute_scalar(self, input_data: int) -> int:
+        """
+        Performs permutation using the P-box one group of equally shifted bits at a time.
+
+        Args:
+            input_data (int): Input data.
+
+        Returns:
+            int: Permuted output.
+        """
+        output_data = 0
+        for mask, shift in self._perm_masks:
+            if shift >= 0:
+                output_data |= (input_data & mask) << shift
+            else:
+                output_data |= (input_data & mask) >> -shift
         return output_data
 
     def substitute(self, input_data: int, invert: bool = False) -> int:
@@ -102,13 +151,46 @@ class SP_Network:
         Returns:
             int: Substituted output.
         """
+        return (self._inv_sub_lut if invert else self._sub_lut)[input_data]
+
+    def _substitute_scalar(self, input_data: int, invert: bool = False) -> int:
+        """
+        Performs substitution using the S-box one nibble at a time.
+
+        Args:
+            input_data (int): Input data.
+            invert (bool): Whether to perform inversion.
+
+        Returns:
+            int: Substituted output.
+        """
+        sbox_table = self.sbox_inv if invert else self.sbox_fwd
         output_data = 0
         for i in range(0, self.data_size, 4):
             group = (input_data >> (self.data_size - i - 4)) & 0xF
-            sbox_result = self.sbox(group, invert)
-            output_data = (output_data << 4) | sbox_result
+            output_data = (output_data << 4) | sbox_table[group]
         return output_data
 
+    @cached_property
+    def _round_lut(self) -> array:
+        """
+        Lookup table for a full encryption round without key mixing (substitute then permute).
+
+        Returns:
+            array: Round output indexed by key-mixed input.
+        """
+        return array('H', (self._perm_lut[value] for value in self._sub_lut))
+
+    @cached_property
+    def _inv_round_lut(self) -> array:
+        """
+        Lookup table for a full decryption round without key mixing (permute then inverse substitute).
+
+        Returns:
+            array: Round output indexed by input.
+        """
+        return array('H', (self._inv_sub_lut[value] for value in self._perm_lut))
+
     def run_round(self, index: int, input_data: int):
         """
         Executes a single encryption round of the SP network.
@@ -120,9 +202,7 @@ class SP_Network:
         Returns:
             int: Output data after the round.
         """
-        buffer = self.keymix(index, input_data)
-        buffer = self.substitute(buffer)
-        return self.permute(buffer)
+        return self._round_lut[self.keys[index] ^ input_data]
 
     def run_reverse_round(self, index: int, input_data: int):
         """
@@ -135,9 +215,7 @@ class SP_Network:
         Returns:
             int: Output data after the round.
         """
-        buffer = self.permute(input_data)
-        buffer = self.substitute(buffer, True)
-        return self.keymix(index, buffer)
+        return self.keys[index] ^ self._inv_round_lut[input_data]
 
     def run_last_round(self, input_data):
         """
@@ -177,11 +255,24 @@ class SP_Network:
         Returns:
             int: Encrypted ciphertext.
         """
-        buffer = plain
+        return self._compiled_encrypt(plain)
+
+    def encrypt_array(self, plains: np.ndarray) -> np.ndarray:
+        """
+        Encrypts an array of plaintexts, one vectorized table lookup per round.
+
+        Args:
+            plains (np.ndarray): Plaintexts to encrypt.
+
+        Returns:
+            np.ndarray: Encrypted ciphertexts as a uint16 array.
+        """
+        round_lut = np.frombuffer(self._round_lut, dtype=np.uint16)
+        sub_lut = np.frombuffer(self._sub_lut, dtype=np.uint16)
+        buffer = np.asarray(plains, dtype=np.uint16)
         for i in range(self.rounds - 1):
-            buffer = self.run_round(i, buffer)
-        buffer = self.run_last_round(buffer)
-        return buffer
+            buffer = round_lut[self.keys[i] ^ buffer]
+        return self.keys[self.rounds] ^ sub_lut[self.keys[self.rounds - 1] ^ buffer]
 
     def decrypt(self, cipher: int) -> int:
         """
@@ -193,7 +284,52 @@ class SP_Network:
         Returns:
             int: Decrypted plaintext.
         """
-        buffer = self.run_reverse_last_round(cipher)
+        return self._compiled_decrypt(cipher)
+
+    @cached_property
+    def _compiled_encrypt(self):
+        """
+        Straight-line encryption function with the round keys and lookup tables inlined.
+
+        Returns:
+            function: Function mapping a plaintext to its ciphertext.
+        """
+        expression = 'plain'
+        for i in range(self.rounds - 1):
+            expression = f"round_lut[{self.keys[i]} ^ {expression}]"
+        expression = f"{self.keys[self.rounds]} ^ sub_lut[{self.keys[self.rounds - 1]} ^ {expression}]"
+        return self._compile_function('encrypt', 'plain', expression,
+                                      round_lut=self._round_lut, sub_lut=self._sub_lut)
+
+    @cached_property
+    def _compiled_decrypt(self):
+        """
+        Straight-line decryption function with the round keys and lookup tables inlined.
+
+        Returns:
+            function: Function mapping a ciphertext to its plaintext.
+        """
+        expression = f"{self.keys[self.rounds - 1]} ^ inv_sub_lut[{self.keys[self.rounds]} ^ cipher]"
         for i in range(self.rounds - 2, -1, -1):
-            buffer = self.run_reverse_round(i, buffer)
-        return buffer
\ No newline at end of file
+            expression = f"{self.keys[i]} ^ inv_round_lut[{expression}]"
+        return self._compile_function('decrypt', 'cipher', expression,
+                                      inv_round_lut=self._inv_round_lut, inv_sub_lut=self._inv_sub_lut)
+
+    @staticmethod
+    def _compile_function(name: str, argument: str, expression: str, **tables):
+        """
+        Compiles a single-argument function returning the given expression.
+
+        Args:
+            name (str): Name of the function.
+            argument (str): Name of the function argument.
+            expression (str): Expression returned by the function.
+            **tables: Lookup tables referenced by the expression.
+
+        Returns:
+            function: The compiled function.
+        """
+        source = f"def {name}({argument}):\n    return {expression}\n"
+        namespace = dict(tables)
+        exec(compile(source, f"<{name}>", 'exec'), namespace)
+        return namespace[name]
\ No newline at end of file